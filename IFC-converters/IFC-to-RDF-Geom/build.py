@@ -9,6 +9,7 @@ import sys
 import subprocess
 import platform
 import shutil
+from importlib.metadata import distribution, PackageNotFoundError
 from pathlib import Path
 
 def get_repo_root():
@@ -45,26 +46,22 @@ def get_platform_info():
 
 def check_dependencies():
     """Check if required dependencies are installed"""
+    # Distribution metadata is enough to tell a package is installed, without importing it
     required_packages = [
-        ("PyInstaller", "pyinstaller"),  # (import_name, pip_name)
-        ("ifcopenshell", "ifcopenshell"), 
-        ("rdflib", "rdflib"),
-        ("numpy", "numpy"),
-        ("pygltflib", "pygltflib")
+        "pyinstaller",
+        "ifcopenshell",
+        "rdflib",
+        "numpy"
     ]
     
     print("Checking dependencies...")
     missing_packages = []
     
-    for import_name, pip_name in required_packages:
+    for pip_name in required_packages:
         try:
-            if import_name == "PyInstaller":
-                # Special case for PyInstaller
-                import PyInstaller
-            else:
-                __import__(import_name)
+            distribution(pip_name)
             print(f"[OK] {pip_name}")
-        except ImportError:
+        except PackageNotFoundError:
             missing_packages.append(pip_name)
             print(f"[MISSING] {pip_name}")
     
@@ -113,13 +110,13 @@ def build_executable(source_dir, platform_info):
     print(f"Command: {' '.join(cmd)}")
     print(f"Dist directory will be: {dist_dir}")
     
-    # Run PyInstaller
-    result = subprocess.run(cmd, capture_output=True, text=True, shell=True)
+    # Run PyInstaller, streaming its output as it is produced
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
+    for line in process.stdout:
+        print(line, end='')
     
-    if result.returncode != 0:
+    if process.wait() != 0:
         print("PyInstaller failed!")
-        print("STDOUT:", result.stdout)
-        print("STDERR:", result.stderr)
         return False
     
     print("PyInstaller completed successfully!")
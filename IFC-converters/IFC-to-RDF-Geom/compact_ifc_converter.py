@@ -4,23 +4,63 @@ Author: Assistant
 Description: Self-contained converter for IFC files to RDF metadata and GLB geometry
 """
 
-import ifcopenshell
-import ifcopenshell.geom
 from rdflib import Graph, Namespace, Literal, URIRef
+from rdflib.plugins.stores.memory import SimpleMemory
+import hashlib
 import json
 import pathlib
 import os
+import struct
 import logging
+import multiprocessing
 import numpy as np
-from pygltflib import GLTF2, Scene, Node, Mesh, Primitive, Accessor, BufferView, Buffer, Material, PbrMetallicRoughness
 import uuid
+from collections import defaultdict
+from functools import lru_cache
 from typing import Dict, Optional, List, Tuple, Any
 import sys
 
+# Optional faster JSON parsing/encoding, falls back to the standard json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional Jelly (binary RDF) output, pyjelly registers a 'jelly' rdflib serializer
+try:
+    import pyjelly
+except ImportError:
+    pyjelly = None
+
+# Optional Draco geometry compression for the GLB output
+try:
+    import DracoPy
+except ImportError:
+    DracoPy = None
+
+# ifcopenshell is imported on first use (see _import_ifcopenshell), loading its native
+# library dominates start-up and is not needed for --help
+ifcopenshell = None
+
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Relation attributes ignored when looking for the content of an inverse attribute
+_INVERSE_SKIP = frozenset({
+    'GlobalId', 'OwnerHistory', 'Name', 'Description',
+    'RelatedObjectsType', 'ActingRole', 'ConnectionGeometry',
+    'QuantityInProcess', 'SequenceType', 'TimeLag',
+    'UserDefinedSequenceType'
+})
+
+def _import_ifcopenshell():
+    """Import ifcopenshell and the submodules used by the converter"""
+    global ifcopenshell
+    import ifcopenshell
+    import ifcopenshell.geom
+    import ifcopenshell.util.element
+
 def resource_path(relative_path):
     """Get absolute path to resource, works for dev and for PyInstaller"""
     try:
@@ -29,9 +69,98 @@ def resource_path(relative_path):
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
+def _nt_object(term) -> str:
+    """N-Triples form of an object term, literals are escaped onto one line (n3() uses triple quotes for multi-line text)"""
+    if not isinstance(term, Literal):
+        return term.n3()
+    
+    value = str(term).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n').replace('\r', '\\r')
+    if term.language:
+        return f'"{value}"@{term.language}'
+    if term.datatype:
+        return f'"{value}"^^<{term.datatype}>'
+    return f'"{value}"'
+
+class StreamingNTSink:
+    """Write-only triple sink that streams N-Triples to disk instead of building a Graph in memory
+    
+    Triples added before open() are held in memory. The file is written to a temporary path and only
+    moved into place by close(), so a failed conversion leaves no partial output.
+    """
+    
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._temp_path = f"{file_path}.part"
+        self._file = None
+        self._pending = []
+        self._count = 0
+    
+    def bind(self, prefix: str, namespace: Namespace):
+        """N-Triples have no prefixes"""
+    
+    def add(self, triple: Tuple):
+        self.addN([triple])
+    
+    def addN(self, quads):
+        """Write triples (or quads, the context is ignored) as N-Triples lines"""
+        write = self._pending.append if self._file is None else self._file.write
+        
+        for quad in quads:
+            write(f"{quad[0].n3()} {quad[1].n3()} {_nt_object(quad[2])} .\n")
+            self._count += 1
+    
+    def open(self):
+        """Start streaming to the temporary file, writing the triples held so far"""
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.file_path) or '.', exist_ok=True)
+            self._file = open(self._temp_path, 'w', encoding='utf-8', buffering=1 << 20)
+            self._file.writelines(self._pending)
+            self._pending.clear()
+    
+    def close(self):
+        """Finish the file and move it to its final path"""
+        self.open()
+        self._file.close()
+        self._file = None
+        os.replace(self._temp_path, self.file_path)
+    
+    def discard(self):
+        """Drop the output of an unfinished conversion"""
+        self._pending.clear()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            os.remove(self._temp_path)
+    
+    def __len__(self) -> int:
+        return self._count
+
 class CompactIFCConverter:
     """Compact IFC converter with external conversion map configuration"""
     
+    # IFC (Z-up) to GLB (Y-up) axis conversion: (x, y, z) -> (x, z, -y)
+    Z_UP_TO_Y_UP = np.array([
+        [1.0, 0.0, 0.0, 0.0],
+        [0.0, 0.0, 1.0, 0.0],
+        [0.0, -1.0, 0.0, 0.0],
+        [0.0, 0.0, 0.0, 1.0]
+    ])
+    
+    # Number of queued triples that triggers a bulk insert into the graph
+    TRIPLE_BATCH_SIZE = 10000
+    
+    # XSD datatype names for EXPRESS simple types (enumerations are written as strings)
+    XSD_DATATYPES = {
+        'string': 'string',
+        'binary': 'string',
+        'enumeration': 'string',
+        'boolean': 'boolean',
+        'logical': 'boolean',
+        'integer': 'integer',
+        'real': 'float',
+        'number': 'float'
+    }
+    
     # Default color mapping by IFC type
     DEFAULT_COLORS = {
         'IfcWall': (0.8, 0.8, 0.8, 1.0),
@@ -46,6 +175,25 @@ class CompactIFCConverter:
         'default': (0.5, 0.5, 0.5, 1.0)
     }
     
+    # BOT predicate linking a spatial element to an aggregated child of this type (or subtype)
+    SPATIAL_PREDICATES = {
+        'IfcSpace': 'hasSpace',
+        'IfcBuildingStorey': 'hasStorey',
+        'IfcBuilding': 'hasBuilding',
+        'IfcFacility': 'hasBuilding'
+    }
+    
+    # RDF output formats: rdflib serializer and file extension
+    RDF_FORMATS = {
+        'nt': ('nt', 'nt'),
+        'turtle': ('turtle', 'ttl'),
+        'jelly': ('jelly', 'jelly')
+    }
+    
+    # Draco quantization of positions and (octahedral) normals
+    DRACO_QUANTIZATION_BITS = 14
+    DRACO_NORMAL_QUANTIZATION_BITS = 10
+    
     def __init__(self, 
                  ifc_file_path: str,
                  asset_name: Optional[str] = None,
@@ -53,7 +201,9 @@ class CompactIFCConverter:
                  rdf_output_path: str = "./data/rdf",
                  glb_output_path: str = "./data/glb",
                  convert_geometry: bool = True,
-                 conversion_map_path: Optional[str] = None):
+                 conversion_map_path: Optional[str] = None,
+                 compress_geometry: bool = False,
+                 rdf_format: str = 'nt'):
         """
         Initialize compact IFC converter
         
@@ -65,8 +215,13 @@ class CompactIFCConverter:
             glb_output_path: Directory for GLB output
             convert_geometry: Whether to generate GLB file
             conversion_map_path: Path to conversion-map.json file
+            compress_geometry: Whether to Draco-compress GLB geometry (requires DracoPy)
+            rdf_format: RDF output format ('nt', 'turtle' or 'jelly')
         """
         
+        if ifcopenshell is None:
+            _import_ifcopenshell()
+        
         # Configuration
         self.ifc_file_path = ifc_file_path
         self.asset_name = asset_name or pathlib.Path(ifc_file_path).stem
@@ -74,9 +229,20 @@ class CompactIFCConverter:
         self.rdf_output_path = rdf_output_path
         self.glb_output_path = glb_output_path
         self.convert_geometry = convert_geometry
+        self.compress_geometry = compress_geometry and DracoPy is not None
+        if compress_geometry and DracoPy is None:
+            logger.warning("DracoPy is not installed, GLB geometry will not be compressed")
+        
+        if rdf_format not in self.RDF_FORMATS:
+            raise ValueError(f"Unsupported RDF format: {rdf_format}")
+        if rdf_format == 'jelly' and pyjelly is None:
+            logger.warning("pyjelly is not installed, RDF will be written as N-Triples")
+            rdf_format = 'nt'
+        self.rdf_format = rdf_format
         
         # Load conversion map
         self.conversion_map = self._load_conversion_map(conversion_map_path)
+        self._class_set = frozenset(self.conversion_map['classes'])
         
         # IFC processing
         self.ifc_file = None
@@ -84,17 +250,42 @@ class CompactIFCConverter:
         self.settings = None
         
         # GLB processing
-        self.elements_data = []
+        # Per-element records kept as parallel lists (structure of arrays)
+        self.element_global_ids = []
+        self.element_types = []
+        self.element_geom_hashes = []
+        self.element_material_indices = []
+        self.element_matrices = []
+        self.element_vertex_counts = []
+        self.element_face_counts = []
+        self.geometries = {}
         self.binary_data = bytearray()
+        self.index_data = bytearray()
+        self._total_vertices = 0
+        self._total_faces = 0
         self.materials_map = {}
         
         # RDF processing
-        self.graph = Graph()
+        if self.rdf_format == 'nt':
+            # N-Triples are streamed to disk as they are produced, other formats serialize a full Graph
+            self.graph = StreamingNTSink(os.path.join(self.rdf_output_path, f"{self.asset_name}.nt"))
+        else:
+            # The graph is only written once and never queried, so skip the indexed Memory store
+            self.graph = Graph(store=SimpleMemory())
+        self._triple_buffer = []
         self.created_entities = {}
+        self._uri_cache = {}
         self.properties_cache = {}
+        self._agg_children = defaultdict(list)
+        self._spatial_predicate = {}
         self.type_maps = {}
+        self._attr_plan_cache = {}
+        self._inv_attr_plan_cache = {}
+        self._reference_attrs_cache = {}
         
         # Results
+        self.glb_file_size = None
+        self.rdf_file_size = None
         self.conversion_results = {
             'success': False,
             'files': {},
@@ -103,6 +294,10 @@ class CompactIFCConverter:
         }
         
         self._setup_namespaces()
+        self._spatial_predicate = {
+            entity_type: self.namespaces['BOT'][predicate]
+            for entity_type, predicate in self.SPATIAL_PREDICATES.items()
+        }
         logger.info(f"CompactIFCConverter initialized for: {self.asset_name}")
     
     def _load_conversion_map(self, conversion_map_path: Optional[str] = None) -> Dict:
@@ -124,8 +319,13 @@ class CompactIFCConverter:
         
         try:
             logger.info(f"Loading conversion map from: {map_path_str}")
-            with open(map_path_str, 'r', encoding='utf-8') as f:
-                conversion_map = json.load(f)
+            if orjson:
+                with open(map_path_str, 'rb') as f:
+                    conversion_map = orjson.loads(f.read())
+            else:
+                with open(map_path_str, 'r', encoding='utf-8') as f:
+                    conversion_map = json.load(f)
+            self._intern_conversion_map(conversion_map)
             logger.info(f"Conversion map loaded successfully")
             return conversion_map
 
@@ -133,6 +333,29 @@ class CompactIFCConverter:
             logger.error(f"Error loading conversion map from {map_path_str}: {e}")
             raise FileNotFoundError(f"Failed to load conversion map from {map_path_str}: {e}") from e
     
+    @staticmethod
+    def _intern_conversion_map(conversion_map: Dict):
+        """Replace the URI strings of the conversion map in place with shared URIRef objects"""
+        pool = {}
+        
+        def intern(uri):
+            uri_ref = pool.get(uri)
+            if uri_ref is None:
+                uri_ref = pool[uri] = URIRef(uri)
+            return uri_ref
+        
+        for class_config in conversion_map.get('classes', {}).values():
+            class_config['class'] = [intern(uri) for uri in class_config.get('class', [])]
+            for key in ('attrs', 'inv_attrs'):
+                attrs_config = class_config.get(key, {})
+                for attr_name, uri in attrs_config.items():
+                    attrs_config[attr_name] = intern(uri)
+        
+        for key in ('psets', 'qsets'):
+            for set_config in conversion_map.get(key, {}).values():
+                for prop_name, uri in set_config.items():
+                    set_config[prop_name] = intern(uri)
+    
     def _setup_namespaces(self):
         """Setup RDF namespaces"""
         self.namespaces = {
@@ -148,26 +371,42 @@ class CompactIFCConverter:
             'OWL': Namespace("http://www.w3.org/2002/07/owl#")
         }
         
+        # Namespace and terms used for every entity, bound once
+        self.INST = self.namespaces['INST']
+        self.RDF_type = self.namespaces['RDF'].type
+        self.RDFS_label = self.namespaces['RDFS'].label
+        self.XSD_string = self.namespaces['XSD'].string
+        self.XSD_anyURI = self.namespaces['XSD'].anyURI
+        self.XSD_nnint = self.namespaces['XSD'].nonNegativeInteger
+        self.OMG_Geometry = self.namespaces['OMG'].Geometry
+        self.GOM_MeshGeometry = self.namespaces['GOM'].MeshGeometry
+        
         # Bind prefixes
         for prefix, namespace in self.namespaces.items():
             self.graph.bind(prefix.lower(), namespace)
         
         # Add ontology declaration
         asset_ref = URIRef(self.base_url)
-        self.graph.add((asset_ref, self.namespaces['RDF'].type, self.namespaces['OWL'].Ontology))
+        self.graph.add((asset_ref, self.RDF_type, self.namespaces['OWL'].Ontology))
     
     def _generate_global_id(self) -> str:
         """Generate GlobalId"""
         return str(uuid.uuid4())
     
     def _get_instance_uri(self, entity) -> Tuple[URIRef, str]:
-        """Get instance URI using GlobalId or generate new one"""
+        """Get instance URI using GlobalId or generate new one, cached per entity id"""
+        key = entity.id()
+        cached = self._uri_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        # The compressed 22-character IFC GUID is URI-safe and used as is
         global_id = getattr(entity, 'GlobalId', None)
         if not global_id or not global_id.strip():
             global_id = self._generate_global_id()
-        else:
-            global_id = ifcopenshell.guid.split(ifcopenshell.guid.expand(global_id)).strip("{}")
-        return self.namespaces['INST'][global_id], global_id
+        
+        cached = self._uri_cache[key] = (self.INST[global_id], global_id)
+        return cached
     
     def load_ifc(self) -> bool:
         """Load and setup IFC file"""
@@ -181,8 +420,11 @@ class CompactIFCConverter:
             
             # Setup geometry settings
             self.settings = ifcopenshell.geom.settings()
-            self.settings.set(self.settings.USE_WORLD_COORDS, True)
-            self.settings.set(self.settings.WELD_VERTICES, True)
+            # Local coordinates so that repeated geometry can be instanced
+            self.settings.set(self.settings.USE_WORLD_COORDS, False)
+            # Unwelded vertices keep per-face normals on sharp edges
+            self.settings.set(self.settings.WELD_VERTICES, False)
+            self.settings.set(self.settings.DISABLE_OPENING_SUBTRACTIONS, False)
             
             logger.info(f"IFC loaded successfully. Schema: {self.ifc_file.schema}")
             return True
@@ -194,51 +436,28 @@ class CompactIFCConverter:
             return False
     
     def _cache_properties(self):
-        """Cache properties and quantity sets"""
+        """Cache properties, quantity sets and the aggregation index"""
         logger.info("Caching IFC properties...")
         
         try:
-            p_rels = self.ifc_file.by_type('IfcRelDefinesByProperties')
+            # Aggregated children per relating object, indexed in a single pass
+            for agg in self.ifc_file.by_type('IfcRelAggregates'):
+                self._agg_children[agg.RelatingObject.id()].extend(agg.RelatedObjects)
             
-            for rel in p_rels:
-                try:
-                    p = rel.RelatingPropertyDefinition
-                    property_data = {"name": getattr(p, 'Name', '')}
-                    
-                    # Process quantities and properties
-                    if p.is_a('IfcElementQuantity'):
-                        for quantity in getattr(p, 'Quantities', []):
-                            qty_type = quantity.is_a()
-                            if qty_type == 'IfcQuantityArea' and hasattr(quantity, 'AreaValue'):
-                                property_data[quantity.Name] = quantity.AreaValue
-                            elif qty_type == 'IfcQuantityLength' and hasattr(quantity, 'LengthValue'):
-                                property_data[quantity.Name] = quantity.LengthValue
-                            elif qty_type == 'IfcQuantityVolume' and hasattr(quantity, 'VolumeValue'):
-                                property_data[quantity.Name] = quantity.VolumeValue
-                    
-                    elif p.is_a('IfcPropertySet'):
-                        for prop in getattr(p, 'HasProperties', []):
-                            try:
-                                if hasattr(prop, 'Name') and hasattr(prop, 'NominalValue'):
-                                    property_data[prop.Name] = prop.NominalValue.wrappedValue
-                            except:
-                                continue
-                    
-                    # Cache for related objects
-                    for obj in rel.RelatedObjects:
-                        global_id = getattr(obj, 'GlobalId', None)
-                        if global_id:
-                            if global_id not in self.properties_cache:
-                                self.properties_cache[global_id] = {'psets': [], 'qsets': []}
-                            
-                            if p.is_a('IfcElementQuantity'):
-                                self.properties_cache[global_id]['qsets'].append(property_data)
-                            elif p.is_a('IfcPropertySet'):
-                                self.properties_cache[global_id]['psets'].append(property_data)
+            # Single sweep over products, property and quantity sets keyed by set name
+            by_id = self.ifc_file.by_id
+            for product in self.ifc_file.by_type('IfcProduct'):
+                # One walk of IsDefinedBy and the type object, sets split by their definition entity
+                psets, qsets = {}, {}
+                for name, definition in ifcopenshell.util.element.get_psets(product).items():
+                    entity = by_id(definition['id'])
+                    if entity.is_a('IfcElementQuantity'):
+                        qsets[name] = definition
+                    elif entity.is_a('IfcPropertySet') or entity.is_a('IfcPreDefinedPropertySet'):
+                        psets[name] = definition
                 
-                except Exception as e:
-                    logger.debug(f"Error processing property: {e}")
-                    continue
+                if psets or qsets:
+                    self.properties_cache[product.GlobalId] = {'psets': psets, 'qsets': qsets}
             
             logger.info(f"Properties cached for {len(self.properties_cache)} objects")
             
@@ -258,89 +477,85 @@ class CompactIFCConverter:
         logger.info("Processing geometry for GLB conversion...")
         
         try:
-            elements = self.ifc_file.by_type('IfcProduct')
-            total_elements = len(elements)
+            total_elements = len(self.ifc_file.by_type('IfcProduct'))
             processed_count = 0
-            skipped_count = 0
             
-            logger.debug(f"Found {total_elements} IfcProduct elements to process")
+            logger.debug("Found %s IfcProduct elements to process", total_elements)
             
-            for element_idx, element in enumerate(elements):
-                try:
-                    element_type = element.is_a()
-                    element_name = getattr(element, 'Name', 'Unnamed')
-                    
-                    logger.debug(f"[{element_idx+1}/{total_elements}] Processing {element_type} '{element_name}' (ID: {element.id()})")
-                    
-                    if not hasattr(element, 'Representation') or not element.Representation:
-                        logger.debug(f"  -> Skipped: No representation")
-                        skipped_count += 1
-                        continue
-                    
-                    representations = element.Representation.Representations
-                    logger.debug(f"  -> Found {len(representations)} representations")
+            # Batch shape generation over all products using one worker per core
+            iterator = ifcopenshell.geom.iterator(self.settings, self.ifc_file, multiprocessing.cpu_count())
+            debug = logger.isEnabledFor(logging.DEBUG)
+            
+            if iterator.initialize():
+                while True:
+                    shape = iterator.get()
                     
-                    for rep_index, representation in enumerate(representations):
-                        try:
-                            rep_type = representation.RepresentationType if hasattr(representation, 'RepresentationType') else 'Unknown'
-                            logger.debug(f"    -> Processing representation {rep_index} (Type: {rep_type})")
+                    try:
+                        element = self.ifc_file.by_id(shape.id)
+                        element_type = element.is_a()
+                        
+                        if debug:
+                            logger.debug("Processing %s '%s' (ID: %s)", element_type, getattr(element, 'Name', 'Unnamed'), shape.id)
+                        
+                        vertices = np.asarray(shape.geometry.verts, dtype=np.float32).reshape((-1, 3))
+                        normals = np.asarray(shape.geometry.normals, dtype=np.float32).reshape((-1, 3))
+                        faces = np.array(shape.geometry.faces).reshape((-1, 3))
+                        
+                        if debug:
+                            logger.debug("  -> Original geometry: %s vertices, %s faces", len(vertices), len(faces))
+                        
+                        if len(vertices) > 0 and len(faces) > 0:
+                            color = self.get_element_color(element)
+                            material_index = self._get_or_create_material(color)
                             
-                            shape = ifcopenshell.geom.create_shape(self.settings, element, representation)
-
-                            logger.debug("shape created")
+                            _, global_id = self._get_instance_uri(element)
                             
-                            if shape and shape.geometry:
-                                vertices = np.array(shape.geometry.verts).reshape((-1, 3))
-                                faces = np.array(shape.geometry.faces).reshape((-1, 3))
-                                
-                                logger.debug(f"       Original geometry: {len(vertices)} vertices, {len(faces)} faces")
-                                
-                                # Convert coordinates IFC (Z-up) to GLB (Y-up)
-                                vertices_converted = vertices.copy()
-                                vertices_converted[:, [1, 2]] = vertices_converted[:, [2, 1]]
-                                vertices_converted[:, 2] = -vertices_converted[:, 2]
-                                
-                                if len(vertices_converted) > 0 and len(faces) > 0:
-                                    color = self.get_element_color(element)
-                                    material_index = self._get_or_create_material(color)
-                                    
-                                    _, global_id = self._get_instance_uri(element)
-                                    
-                                    element_data = {
-                                        'name': f"{global_id}_{rep_index}" if len(representations) > 1 else global_id,
-                                        'vertices': vertices_converted,
-                                        'faces': faces,
-                                        'material_index': material_index,
-                                        'color': color,
-                                        'global_id': global_id,
-                                        'element_type': element.is_a(),
-                                        'element_id': element.id(),
-                                        'representation_index': rep_index,
-                                        'vertex_count': len(vertices_converted),
-                                        'face_count': len(faces)
-                                    }
-                                    
-                                    self.elements_data.append(element_data)
-                                    processed_count += 1
-                                    
-                                    logger.debug(f"       Successfully processed: Material={material_index}, Color={color}")
-                                else:
-                                    logger.debug(f"       Skipped: Empty geometry after conversion")
-                            else:
-                                logger.debug(f"       Skipped: No geometry data")
-                        
-                        except Exception as e:
-                            logger.debug(f"       Error processing representation {rep_index}: {e}")
-                            continue
-                
-                except Exception as e:
-                    logger.debug(f"  -> Error processing element: {e}")
-                    continue
+                            if len(normals) != len(vertices):
+                                normals = self._compute_vertex_normals(vertices, faces)
+                            
+                            # Interleave [px, py, pz, nx, ny, nz] per vertex and convert
+                            # IFC (Z-up) to GLB (Y-up): (x, y, z) -> (x, z, -y)
+                            vertex_data = np.empty((len(vertices), 6), dtype=np.float32)
+                            for source, column in ((vertices, 0), (normals, 3)):
+                                vertex_data[:, column] = source[:, 0]
+                                vertex_data[:, column + 1] = source[:, 2]
+                                np.negative(source[:, 1], out=vertex_data[:, column + 2])
+                            
+                            # Share identical local geometry between elements
+                            geom_hash = hashlib.blake2b(digest_size=16)
+                            geom_hash.update(vertex_data.tobytes())
+                            geom_hash.update(faces.tobytes())
+                            geom_hash = geom_hash.digest()
+                            if geom_hash not in self.geometries:
+                                self.geometries[geom_hash] = self._stream_geometry(vertex_data, faces)
+                            
+                            self.element_global_ids.append(global_id)
+                            self.element_types.append(element_type)
+                            self.element_geom_hashes.append(geom_hash)
+                            self.element_material_indices.append(material_index)
+                            self.element_matrices.append(self._convert_placement(shape.transformation.matrix))
+                            self.element_vertex_counts.append(len(vertex_data))
+                            self.element_face_counts.append(len(faces))
+                            
+                            self._total_vertices += len(vertex_data)
+                            self._total_faces += len(faces)
+                            processed_count += 1
+                            
+                            if debug:
+                                logger.debug("  -> Successfully processed: Material=%s, Color=%s", material_index, color)
+                        else:
+                            logger.debug("  -> Skipped: Empty geometry after conversion")
+                    
+                    except Exception as e:
+                        logger.debug("  -> Error processing shape %s: %s", shape.id, e)
+                    
+                    if not iterator.next():
+                        break
             
             logger.info(f"Geometry processing complete:")
             logger.info(f"  - Total elements: {total_elements}")
             logger.info(f"  - Processed: {processed_count} representations")
-            logger.info(f"  - Skipped: {skipped_count} elements (no representation)")
+            logger.info(f"  - Skipped: {total_elements - processed_count} elements (no geometry)")
             
             return processed_count > 0
             
@@ -350,147 +565,301 @@ class CompactIFCConverter:
             self.conversion_results['errors'].append(error_msg)
             return False
     
+    def _stream_geometry(self, vertex_data: np.ndarray, faces: np.ndarray) -> Dict[str, Any]:
+        """Write a geometry into the binary buffers right away and keep only its accessor metadata"""
+        if self.compress_geometry:
+            return self._stream_draco_geometry(vertex_data, faces)
+        
+        positions = vertex_data[:, :3]
+        vertex_min = positions.min(axis=0)
+        vertex_max = positions.max(axis=0)
+        if not orjson:
+            vertex_min, vertex_max = vertex_min.tolist(), vertex_max.tolist()
+        
+        # Use UNSIGNED_SHORT indices where the vertex count allows it, UNSIGNED_INT otherwise
+        index_dtype = np.uint16 if len(vertex_data) <= 65535 else np.uint32
+        indices = faces.reshape(-1).astype(index_dtype, copy=False)
+        
+        # Interleaved vertex rows are 24 bytes, so the vertex buffer stays contiguous;
+        # 4-byte alignment of the indices suits either component size
+        vtx_offset, vtx_len = self._add_binary_data(vertex_data)
+        idx_offset, idx_len = self._add_binary_data(indices, self.index_data)
+        
+        return {
+            'vtx_offset': vtx_offset, 'vtx_len': vtx_len, 'vtx_count': len(vertex_data),
+            'idx_offset': idx_offset, 'idx_len': idx_len, 'idx_count': indices.size,
+            'idx_component_type': 5123 if index_dtype is np.uint16 else 5125,
+            'min': vertex_min, 'max': vertex_max
+        }
+    
+    def _stream_draco_geometry(self, vertex_data: np.ndarray, faces: np.ndarray) -> Dict[str, Any]:
+        """Draco-compress a geometry into the binary buffer and keep only its accessor metadata"""
+        encoded = DracoPy.encode(
+            np.ascontiguousarray(vertex_data[:, :3]), faces.astype(np.uint32, copy=False),
+            quantization_bits=self.DRACO_QUANTIZATION_BITS,
+            normals=vertex_data[:, 3:].astype(np.float64),
+            normal_quantization_bits=self.DRACO_NORMAL_QUANTIZATION_BITS
+        )
+        
+        # Accessor counts, bounds and attribute ids must describe the decoded mesh,
+        # which may hold a different number of vertices than the input
+        decoded = DracoPy.decode(encoded)
+        vertex_min = decoded.points.min(axis=0)
+        vertex_max = decoded.points.max(axis=0)
+        if not orjson:
+            vertex_min, vertex_max = vertex_min.tolist(), vertex_max.tolist()
+        
+        draco_offset, draco_len = self._add_binary_data(encoded)
+        
+        return {
+            'draco_offset': draco_offset, 'draco_len': draco_len,
+            'draco_attributes': {
+                'POSITION': decoded.get_attribute_by_type(0)['unique_id'],
+                'NORMAL': decoded.get_attribute_by_type(1)['unique_id']
+            },
+            'vtx_count': len(decoded.points), 'idx_count': decoded.faces.size,
+            'idx_component_type': 5123 if len(decoded.points) <= 65535 else 5125,
+            'min': vertex_min, 'max': vertex_max
+        }
+    
+    def _compute_vertex_normals(self, vertices: np.ndarray, faces: np.ndarray) -> np.ndarray:
+        """Compute per-vertex normals by accumulating unit face normals"""
+        triangles = vertices[faces]
+        face_normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+        face_normals /= np.linalg.norm(face_normals, axis=1, keepdims=True) + 1e-12
+        
+        normals = np.zeros_like(vertices)
+        np.add.at(normals, faces.ravel(), np.repeat(face_normals, 3, axis=0))
+        normals /= np.linalg.norm(normals, axis=1, keepdims=True) + 1e-12
+        return normals
+    
+    def _convert_placement(self, matrix) -> List[float]:
+        """Convert an IFC placement matrix to a Y-up glTF node matrix (column-major)"""
+        placement = np.array(matrix, dtype=np.float64).reshape((4, 4), order='F')
+        converted = self.Z_UP_TO_Y_UP @ placement @ self.Z_UP_TO_Y_UP.T
+        return converted.ravel(order='F').tolist()
+    
     def _get_or_create_material(self, color: Tuple[float, float, float, float]) -> int:
         """Get or create material index for color"""
-        color_key = tuple(color)
-        if color_key not in self.materials_map:
+        # Quantize RGBA to 8 bits per channel so near-identical colors share a material
+        color_key = 0
+        for channel_index, channel in enumerate(color):
+            color_key |= (round(channel * 255) & 0xFF) << (8 * channel_index)
+        
+        material = self.materials_map.get(color_key)
+        if material is None:
             material_index = len(self.materials_map)
-            self.materials_map[color_key] = material_index
-            logger.debug(f"Created new material {material_index} for color {color_key}")
+            self.materials_map[color_key] = (material_index, tuple(color))
+            logger.debug("Created new material %s for color %s", material_index, color)
         else:
-            material_index = self.materials_map[color_key]
-            logger.debug(f"Reusing material {material_index} for color {color_key}")
+            material_index = material[0]
+            logger.debug("Reusing material %s for color %s", material_index, color)
         return material_index
     
-    def _add_binary_data(self, data) -> Tuple[int, int]:
-        """Add data to binary buffer with alignment"""
+    def _add_binary_data(self, data, buffer: Optional[bytearray] = None) -> Tuple[int, int]:
+        """Add data to binary buffer (vertex buffer by default) with alignment"""
+        if buffer is None:
+            buffer = self.binary_data
+        
         if isinstance(data, np.ndarray):
-            binary_data = data.astype(np.float32 if data.dtype != np.uint16 else np.uint16).tobytes()
+            # Keep the dtype of integer data, store floating point data as float32
+            if data.dtype.kind not in 'iu':
+                data = data.astype(np.float32, copy=False)
+            
+            # Byte view through the buffer protocol, no intermediate bytes copy
+            binary_data = memoryview(np.ascontiguousarray(data)).cast('B')
         else:
             binary_data = data
         
         # 4-byte alignment
-        while len(self.binary_data) % 4 != 0:
-            self.binary_data.append(0)
+        padding = -len(buffer) & 3
+        if padding:
+            buffer.extend(b'\x00' * padding)
         
-        byte_offset = len(self.binary_data)
-        self.binary_data.extend(binary_data)
+        byte_offset = len(buffer)
+        buffer.extend(binary_data)
         
         return byte_offset, len(binary_data)
     
+    def _write_glb(self, glb_file_path: str, gltf: Dict) -> int:
+        """Write a GLB container: header, JSON chunk and BIN chunk (each chunk 4-byte aligned), returns the file size"""
+        if orjson:
+            json_chunk = orjson.dumps(gltf, option=orjson.OPT_SERIALIZE_NUMPY)
+        else:
+            json_chunk = json.dumps(gltf, separators=(',', ':')).encode('utf-8')
+        # Padding is written separately so neither chunk payload is copied
+        json_padding = -len(json_chunk) % 4
+        json_length = len(json_chunk) + json_padding
+        # BIN chunk: vertex buffer followed by the index buffer at a 4-byte aligned offset
+        index_padding = -len(self.binary_data) % 4
+        bin_length = len(self.binary_data) + index_padding + len(self.index_data)
+        bin_padding = -bin_length % 4
+        bin_length += bin_padding
+        total_length = 12 + 8 + json_length + 8 + bin_length
+        
+        with open(glb_file_path, 'wb') as f:
+            f.write(struct.pack('<4sII', b'glTF', 2, total_length))
+            f.write(struct.pack('<I4s', json_length, b'JSON'))
+            f.write(json_chunk)
+            f.write(b' ' * json_padding)
+            f.write(struct.pack('<I4s', bin_length, b'BIN\x00'))
+            f.write(self.binary_data)
+            f.write(b'\x00' * index_padding)
+            f.write(self.index_data)
+            f.write(b'\x00' * bin_padding)
+        
+        return total_length
+    
     def create_glb(self) -> Optional[str]:
         """Create GLB file"""
-        if not self.convert_geometry or not self.elements_data:
+        if not self.convert_geometry or not self.element_global_ids:
             return None
         
         try:
-            logger.info(f"Creating GLB with {len(self.elements_data)} elements...")
+            element_count = len(self.element_global_ids)
+            logger.info(f"Creating GLB with {element_count} elements...")
             
-            gltf = GLTF2()
-            gltf.scenes = []
-            gltf.nodes = []
-            gltf.meshes = []
-            gltf.materials = []
-            gltf.accessors = []
-            gltf.bufferViews = []
-            gltf.buffers = []
+            # glTF JSON document built from plain dicts and lists
+            gltf = {
+                'asset': {'version': '2.0', 'generator': 'compact_ifc_converter'},
+                'scene': 0,
+                'scenes': [],
+                'nodes': [],
+                'meshes': [],
+                'materials': [],
+                'accessors': [],
+                'bufferViews': [],
+                'buffers': []
+            }
             
             # Create materials
-            logger.debug(f"Creating {len(self.materials_map)} materials")
-            for color, material_index in self.materials_map.items():
-                material = Material()
-                material.pbrMetallicRoughness = PbrMetallicRoughness()
-                material.pbrMetallicRoughness.baseColorFactor = list(color)
-                material.pbrMetallicRoughness.metallicFactor = 0.0
-                material.pbrMetallicRoughness.roughnessFactor = 0.8
-                material.name = f"Material_{material_index}"
-                gltf.materials.append(material)
-                logger.debug(f"  Material {material_index}: Color={color}")
-            
-            # Process elements
-            node_indices = []
-            total_binary_size = 0
+            logger.debug("Creating %s materials", len(self.materials_map))
+            for material_index, color in self.materials_map.values():
+                gltf['materials'].append({
+                    'name': f"Material_{material_index}",
+                    'pbrMetallicRoughness': {
+                        'baseColorFactor': list(color),
+                        'metallicFactor': 0.0,
+                        'roughnessFactor': 0.8
+                    }
+                })
+                logger.debug("  Material %s: Color=%s", material_index, color)
             
-            logger.debug("Processing elements for GLB:")
-            for elem_idx, element_data in enumerate(self.elements_data):
-                logger.debug(f"  [{elem_idx+1}/{len(self.elements_data)}] Processing {element_data['name']}:")
-                logger.debug(f"    Type: {element_data['element_type']}")
-                logger.debug(f"    Vertices: {element_data['vertex_count']}, Faces: {element_data['face_count']}")
-                
-                vertices = element_data['vertices']
-                faces = element_data['faces'].flatten().astype(np.uint16)
-                material_index = element_data['material_index']
-                
-                # Add to binary buffer
-                vertex_offset, vertex_length = self._add_binary_data(vertices)
-                index_offset, index_length = self._add_binary_data(faces)
-                total_binary_size = len(self.binary_data)
-                
-                logger.debug(f"    Binary data: vertex_offset={vertex_offset}, vertex_length={vertex_length}")
-                logger.debug(f"    Binary data: index_offset={index_offset}, index_length={index_length}")
-                logger.debug(f"    Total binary size: {total_binary_size} bytes")
-                
-                # Create buffer views and accessors
-                vertex_buffer_view = BufferView(buffer=0, byteOffset=vertex_offset, byteLength=vertex_length, target=34962)
-                index_buffer_view = BufferView(buffer=0, byteOffset=index_offset, byteLength=index_length, target=34963)
-                
-                gltf.bufferViews.extend([vertex_buffer_view, index_buffer_view])
+            # Geometry was streamed into the binary buffers during processing: the index
+            # buffer is written right after the vertex buffer
+            vertex_length = len(self.binary_data)
+            index_offset = vertex_length + (-vertex_length % 4)
+            index_length = len(self.index_data)
+            
+            logger.debug("Binary data: vertex_length=%s", vertex_length)
+            logger.debug("Binary data: index_offset=%s, index_length=%s", index_offset, index_length)
+            
+            geometry_accessors = {}
+            draco_extensions = {}
+            
+            if self.compress_geometry:
+                # One buffer view per Draco-compressed geometry; the accessors carry no buffer view
+                for geom_hash, geometry in self.geometries.items():
+                    gltf['bufferViews'].append({'buffer': 0, 'byteOffset': geometry['draco_offset'], 'byteLength': geometry['draco_len']})
+                    draco_extensions[geom_hash] = {
+                        'KHR_draco_mesh_compression': {
+                            'bufferView': len(gltf['bufferViews']) - 1,
+                            'attributes': geometry['draco_attributes']
+                        }
+                    }
+                    
+                    gltf['accessors'].extend([
+                        {'componentType': 5126, 'count': geometry['vtx_count'], 'type': 'VEC3',
+                         'min': geometry['min'], 'max': geometry['max']},
+                        {'componentType': 5126, 'count': geometry['vtx_count'], 'type': 'VEC3'},
+                        {'componentType': geometry['idx_component_type'], 'count': geometry['idx_count'], 'type': 'SCALAR'}
+                    ])
+                    geometry_accessors[geom_hash] = len(gltf['accessors']) - 3
                 
-                vertex_accessor = Accessor(
-                    bufferView=len(gltf.bufferViews) - 2,
-                    componentType=5126, count=len(vertices), type="VEC3",
-                    min=vertices.min(axis=0).tolist(), max=vertices.max(axis=0).tolist()
-                )
-                index_accessor = Accessor(
-                    bufferView=len(gltf.bufferViews) - 1,
-                    componentType=5123, count=len(faces), type="SCALAR"
-                )
+                gltf['extensionsUsed'] = ['KHR_draco_mesh_compression']
+                gltf['extensionsRequired'] = ['KHR_draco_mesh_compression']
+            else:
+                # Shared buffer views: 0 = interleaved positions and normals, 1 = indices
+                gltf['bufferViews'].append({'buffer': 0, 'byteOffset': 0, 'byteLength': vertex_length, 'byteStride': 24, 'target': 34962})
+                gltf['bufferViews'].append({'buffer': 0, 'byteOffset': index_offset, 'byteLength': index_length, 'target': 34963})
                 
-                gltf.accessors.extend([vertex_accessor, index_accessor])
+                # Accessors into the shared buffer views: position, normal and indices per unique geometry
+                for geom_hash, geometry in self.geometries.items():
+                    vertex_accessor = {
+                        'bufferView': 0, 'byteOffset': geometry['vtx_offset'],
+                        'componentType': 5126, 'count': geometry['vtx_count'], 'type': 'VEC3',
+                        'min': geometry['min'], 'max': geometry['max']
+                    }
+                    normal_accessor = {
+                        'bufferView': 0, 'byteOffset': geometry['vtx_offset'] + 12,
+                        'componentType': 5126, 'count': geometry['vtx_count'], 'type': 'VEC3'
+                    }
+                    index_accessor = {
+                        'bufferView': 1, 'byteOffset': geometry['idx_offset'],
+                        'componentType': geometry['idx_component_type'], 'count': geometry['idx_count'], 'type': 'SCALAR'
+                    }
+                    
+                    gltf['accessors'].extend([vertex_accessor, normal_accessor, index_accessor])
+                    geometry_accessors[geom_hash] = len(gltf['accessors']) - 3
+            
+            # Process elements: one mesh per (geometry, material), one node per element
+            node_indices = []
+            mesh_map = {}
+            
+            debug = logger.isEnabledFor(logging.DEBUG)
+            logger.debug("Processing elements for GLB:")
+            elements = zip(self.element_global_ids, self.element_types, self.element_geom_hashes, self.element_material_indices,
+                           self.element_matrices, self.element_vertex_counts, self.element_face_counts)
+            for elem_idx, (global_id, element_type, geom_hash, material_index, matrix, vertex_count, face_count) in enumerate(elements):
+                if debug:
+                    logger.debug("  [%s/%s] Processing %s:", elem_idx+1, element_count, global_id)
+                    logger.debug("    Type: %s", element_type)
+                    logger.debug("    Vertices: %s, Faces: %s", vertex_count, face_count)
                 
-                # Create primitive, mesh, and node
-                primitive = Primitive(
-                    attributes={"POSITION": len(gltf.accessors) - 2},
-                    indices=len(gltf.accessors) - 1,
-                    material=material_index
-                )
+                mesh_key = (geom_hash, material_index)
+                mesh_index = mesh_map.get(mesh_key)
                 
-                mesh = Mesh(primitives=[primitive], name=element_data['name'])
-                node = Node(mesh=len(gltf.meshes), name=element_data['name'])
+                if mesh_index is None:
+                    vertex_accessor_index = geometry_accessors[geom_hash]
+                    primitive = {
+                        'attributes': {'POSITION': vertex_accessor_index, 'NORMAL': vertex_accessor_index + 1},
+                        'indices': vertex_accessor_index + 2,
+                        'material': material_index
+                    }
+                    if geom_hash in draco_extensions:
+                        primitive['extensions'] = draco_extensions[geom_hash]
+                    
+                    mesh_index = len(gltf['meshes'])
+                    mesh_map[mesh_key] = mesh_index
+                    gltf['meshes'].append({'primitives': [primitive], 'name': global_id})
                 
-                gltf.meshes.append(mesh)
-                gltf.nodes.append(node)
-                node_indices.append(len(gltf.nodes) - 1)
+                gltf['nodes'].append({'mesh': mesh_index, 'matrix': matrix, 'name': global_id})
+                node_indices.append(len(gltf['nodes']) - 1)
                 
-                logger.debug(f"    Created: mesh_index={len(gltf.meshes)-1}, node_index={len(gltf.nodes)-1}")
+                if debug:
+                    logger.debug("    Created: mesh_index=%s, node_index=%s", mesh_index, len(gltf['nodes'])-1)
             
             # Create buffer and scene
-            buffer = Buffer(byteLength=len(self.binary_data))
-            gltf.buffers.append(buffer)
-            
-            scene = Scene(nodes=node_indices, name="IFC_Scene")
-            gltf.scenes.append(scene)
-            gltf.scene = 0
-            
-            logger.debug(f"Final GLB structure:")
-            logger.debug(f"  Nodes: {len(gltf.nodes)}")
-            logger.debug(f"  Meshes: {len(gltf.meshes)}")
-            logger.debug(f"  Materials: {len(gltf.materials)}")
-            logger.debug(f"  Accessors: {len(gltf.accessors)}")
-            logger.debug(f"  BufferViews: {len(gltf.bufferViews)}")
-            logger.debug(f"  Buffers: {len(gltf.buffers)}")
-            logger.debug(f"  Binary data size: {len(self.binary_data)} bytes")
+            gltf['buffers'].append({'byteLength': index_offset + index_length})
+            gltf['scenes'].append({'nodes': node_indices, 'name': "IFC_Scene"})
+            
+            logger.debug("Final GLB structure:")
+            logger.debug("  Nodes: %s", len(gltf['nodes']))
+            logger.debug("  Meshes: %s", len(gltf['meshes']))
+            logger.debug("  Materials: %s", len(gltf['materials']))
+            logger.debug("  Accessors: %s", len(gltf['accessors']))
+            logger.debug("  BufferViews: %s", len(gltf['bufferViews']))
+            logger.debug("  Buffers: %s", len(gltf['buffers']))
+            logger.debug("  Binary data size: %s bytes", index_offset + index_length)
             
             # Save GLB
             os.makedirs(self.glb_output_path, exist_ok=True)
             glb_file_path = os.path.join(self.glb_output_path, f"{self.asset_name}.glb")
             
-            logger.debug(f"Saving GLB to: {glb_file_path}")
-            gltf.set_binary_blob(bytes(self.binary_data))
-            gltf.save(glb_file_path)
+            logger.debug("Saving GLB to: %s", glb_file_path)
+            self.glb_file_size = self._write_glb(glb_file_path, gltf)
             
-            file_size = os.path.getsize(glb_file_path)
-            logger.info(f"GLB created: {glb_file_path} ({file_size:,} bytes)")
+            logger.info(f"GLB created: {glb_file_path} ({self.glb_file_size:,} bytes)")
             
             return glb_file_path
             
@@ -500,6 +869,16 @@ class CompactIFCConverter:
             self.conversion_results['errors'].append(error_msg)
             return None
     
+    def _emit(self, subject, predicate, obj):
+        """Queue a triple for bulk insertion into the graph"""
+        self._triple_buffer.append((subject, predicate, obj, self.graph))
+    
+    def _flush_triples(self):
+        """Insert all queued triples into the graph at once"""
+        if self._triple_buffer:
+            self.graph.addN(self._triple_buffer)
+            self._triple_buffer.clear()
+    
     def create_rdf_entities(self):
         """Create RDF entities and relationships"""
         logger.info("Creating RDF entities...")
@@ -509,38 +888,25 @@ class CompactIFCConverter:
             
             for entity in self.ifc_file:
                 entity_type = entity.is_a()
+                if entity_type not in self._class_set:
+                    continue
                 
-                if entity_type in self.conversion_map['classes']:
-                    try:
-                        instance_uri, global_id = self._get_instance_uri(entity)
-                        
-                        if instance_uri not in self.created_entities:
-                            self.created_entities[instance_uri] = True
-                            
-                            # Add entity types
-                            class_uris = self.conversion_map['classes'][entity_type]['class']
-                            for class_uri in class_uris:
-                                self.graph.add((instance_uri, self.namespaces['RDF'].type, URIRef(class_uri)))
-                            
-                            # Add basic properties if available
-                            if hasattr(entity, 'Name') and entity.Name:
-                                self.graph.add((instance_uri, self.namespaces['RDFS'].label, 
-                                              Literal(entity.Name, datatype=self.namespaces['XSD'].string)))
-                            
-                            # Add properties and quantities from cache
-                            self._add_cached_properties(entity, instance_uri, global_id)
-                            
-                            # Add entity attributes if configured
-                            self._add_entity_attributes(entity, instance_uri, entity_type)
-
-                            # Add inverse attributes if configured
-                            self._add_inverse_attributes(entity, instance_uri, entity_type)
-                            
-                            processed_count += 1
-                    
-                    except Exception as e:
-                        logger.debug(f"Error processing entity {entity.id()}: {e}")
-                        continue
+                try:
+                    instance_uri, quads = self._build_entity_quads(entity, entity_type)
+                except Exception as e:
+                    logger.debug("Error processing entity %s: %s", entity.id(), e)
+                    continue
+                
+                # The first entity with a given URI wins
+                if instance_uri in self.created_entities:
+                    continue
+                
+                self.created_entities[instance_uri] = True
+                self._triple_buffer.extend(quads)
+                processed_count += 1
+                
+                if len(self._triple_buffer) >= self.TRIPLE_BATCH_SIZE:
+                    self._flush_triples()
             
             # Process spatial relationships
             self._process_spatial_relationships()
@@ -551,8 +917,37 @@ class CompactIFCConverter:
             error_msg = f"Error creating RDF entities: {e}"
             logger.error(error_msg)
             self.conversion_results['errors'].append(error_msg)
+        
+        finally:
+            self._flush_triples()
     
-    def _add_cached_properties(self, entity, instance_uri: URIRef, global_id: str):
+    def _build_entity_quads(self, entity, entity_type: str) -> Tuple[URIRef, List[Tuple]]:
+        """Build the quads describing a single entity"""
+        instance_uri, global_id = self._get_instance_uri(entity)
+        graph = self.graph
+        quads = []
+        
+        # Add entity types
+        class_uris = self.conversion_map['classes'][entity_type]['class']
+        for class_uri in class_uris:
+            quads.append((instance_uri, self.RDF_type, class_uri, graph))
+        
+        # Add basic properties if available
+        if hasattr(entity, 'Name') and entity.Name:
+            quads.append((instance_uri, self.RDFS_label, Literal(entity.Name, datatype=self.XSD_string), graph))
+        
+        # Add properties and quantities from cache
+        self._add_cached_properties(entity, instance_uri, global_id, quads)
+        
+        # Add entity attributes if configured
+        self._add_entity_attributes(entity, instance_uri, entity_type, quads)
+        
+        # Add inverse attributes if configured
+        self._add_inverse_attributes(entity, instance_uri, entity_type, quads)
+        
+        return instance_uri, quads
+    
+    def _add_cached_properties(self, entity, instance_uri: URIRef, global_id: str, quads: List[Tuple]):
         """Add cached properties and quantities to entity"""
         try:
             # Get original GlobalId from entity for property lookup
@@ -562,212 +957,233 @@ class CompactIFCConverter:
                 cached_props = self.properties_cache[original_global_id]
                 
                 # Add property sets
-                for pset in cached_props.get('psets', []):
-                    pset_name = pset.get('name', '')
+                for pset_name, pset in cached_props['psets'].items():
                     if pset_name in self.conversion_map.get('psets', {}):
                         for key, value_uri in self.conversion_map['psets'][pset_name].items():
                             if key in pset and pset[key] is not None:
-                                self.graph.add((instance_uri, URIRef(value_uri), Literal(pset[key])))
+                                quads.append((instance_uri, value_uri, Literal(pset[key]), self.graph))
                 
                 # Add quantity sets
-                for qset in cached_props.get('qsets', []):
-                    qset_name = qset.get('name', '')
+                for qset_name, qset in cached_props['qsets'].items():
                     if qset_name in self.conversion_map.get('qsets', {}):
                         for key, value_uri in self.conversion_map['qsets'][qset_name].items():
                             if key in qset and qset[key] is not None:
-                                self.graph.add((instance_uri, URIRef(value_uri), Literal(qset[key])))
+                                quads.append((instance_uri, value_uri, Literal(qset[key]), self.graph))
         
         except Exception as e:
-            logger.debug(f"Error adding cached properties for entity: {e}")
+            logger.debug("Error adding cached properties for entity: %s", e)
     
-    def _add_entity_attributes(self, entity, instance_uri: URIRef, entity_type: str):
-        """Add entity attributes based on conversion map"""
-        try:
-            attrs_config = self.conversion_map['classes'][entity_type].get('attrs', {})
+    def _resolve_attribute_datatype(self, attr) -> Tuple[Optional[URIRef], bool]:
+        """Resolve the XSD datatype of a schema attribute, or whether it holds entity references"""
+        data_type = attr.type_of_attribute()
+        
+        while True:
+            named_type = data_type.as_named_type()
             
-            if not attrs_config:
-                return
+            if named_type:
+                declaration = named_type.declared_type()
+                
+                # Unwrap defined types (e.g. IfcLabel -> STRING)
+                if declaration.as_type_declaration():
+                    data_type = declaration.as_type_declaration().declared_type()
+                    continue
+                if declaration.as_enumeration_type():
+                    return self.namespaces['XSD'][self.XSD_DATATYPES['enumeration']], False
+                
+                # Entities and selects resolve to entity instances at runtime
+                return None, True
+            
+            simple_type = data_type.as_simple_type()
+            if simple_type:
+                return self.namespaces['XSD'][self.XSD_DATATYPES[simple_type.declared_type()]], False
             
+            # Aggregates are not mapped
+            return None, False
+    
+    def _get_attribute_plan(self, entity_type: str) -> List[Tuple[int, str, URIRef, bool, Optional[URIRef], bool]]:
+        """Resolve (index, name, property URI, optional, datatype, is_entity) of the mapped attributes of an entity type once"""
+        plan = self._attr_plan_cache.get(entity_type)
+        if plan is not None:
+            return plan
+        
+        plan = []
+        attrs_config = self.conversion_map['classes'][entity_type].get('attrs', {})
+        
+        if attrs_config:
             entity_schema = self.schema.declaration_by_name(entity_type)
-            attr_count = entity_schema.attribute_count()
             
-            for i in range(attr_count):
+            for i in range(entity_schema.attribute_count()):
+                attr = entity_schema.attribute_by_index(i)
+                attr_name = attr.name()
+                
+                if attr_name not in attrs_config:
+                    continue
+                
+                datatype, is_entity = self._resolve_attribute_datatype(attr)
+                
+                if datatype is not None or is_entity:
+                    plan.append((i, attr_name, attrs_config[attr_name], attr.optional(), datatype, is_entity))
+        
+        self._attr_plan_cache[entity_type] = plan
+        return plan
+    
+    def _add_entity_attributes(self, entity, instance_uri: URIRef, entity_type: str, quads: List[Tuple]):
+        """Add entity attributes based on conversion map"""
+        try:
+            for i, attr_name, property_uri, optional, datatype, is_entity in self._get_attribute_plan(entity_type):
                 try:
-                    attr = entity_schema.attribute_by_index(i)
-                    attr_name = attr.name()
-                    
-                    if attr_name not in attrs_config:
-                        continue
-                    
                     # Get attribute value safely
                     try:
                         attr_value = entity[i]
                     except RuntimeError:
-                        if not attr.optional():
-                            logger.debug(f"Required attribute {attr_name} missing for entity {entity.id()}")
+                        if not optional:
+                            logger.debug("Required attribute %s missing for entity %s", attr_name, entity.id())
                         continue
                     
                     if attr_value is None:
                         continue
                     
-                    property_uri = URIRef(attrs_config[attr_name])
-                    
-                    # Add simple attribute values
-                    if isinstance(attr_value, (str, int, float, bool)):
-                        # Determine XSD type
-                        if isinstance(attr_value, str):
-                            datatype = self.namespaces['XSD'].string
-                        elif isinstance(attr_value, bool):
-                            datatype = self.namespaces['XSD'].boolean
-                        elif isinstance(attr_value, int):
-                            datatype = self.namespaces['XSD'].integer
-                        elif isinstance(attr_value, float):
-                            datatype = self.namespaces['XSD'].float
-                        else:
-                            datatype = self.namespaces['XSD'].string
-                        
-                        self.graph.add((instance_uri, property_uri, Literal(attr_value, datatype=datatype)))
-                    
                     # Handle entity references
-                    elif hasattr(attr_value, 'is_a') and attr_value.is_a() in self.conversion_map['classes']:
-                        referenced_uri, _ = self._get_instance_uri(attr_value)
-                        self.graph.add((instance_uri, property_uri, referenced_uri))
+                    if is_entity:
+                        if attr_value.is_a() in self._class_set:
+                            referenced_uri, _ = self._get_instance_uri(attr_value)
+                            quads.append((instance_uri, property_uri, referenced_uri, self.graph))
+                    
+                    # Add simple attribute values with the datatype declared in the schema
+                    else:
+                        quads.append((instance_uri, property_uri, Literal(attr_value, datatype=datatype), self.graph))
                 
                 except Exception as e:
-                    logger.debug(f"Error processing attribute {attr_name}: {e}")
+                    logger.debug("Error processing attribute %s: %s", attr_name, e)
                     continue
         
         except Exception as e:
-            logger.debug(f"Error adding entity attributes: {e}")
+            logger.debug("Error adding entity attributes: %s", e)
     
-    def _add_inverse_attributes(self, entity, instance_uri: URIRef, entity_type: str):
-        """Add inverse attributes based on conversion map"""
-        try:
-            inv_attrs_config = self.conversion_map['classes'][entity_type].get('inv_attrs', {})
-            
-            if not inv_attrs_config:
-                return
-            
+    def _get_inverse_attribute_plan(self, entity_type: str) -> List[Tuple[str, URIRef, str]]:
+        """Resolve (inverse attribute, property URI, relation attribute) of the mapped inverse attributes of an entity type once"""
+        plan = self._inv_attr_plan_cache.get(entity_type)
+        if plan is not None:
+            return plan
+        
+        plan = []
+        inv_attrs_config = self.conversion_map['classes'][entity_type].get('inv_attrs', {})
+        
+        if inv_attrs_config:
             entity_schema = self.schema.declaration_by_name(entity_type)
-            inverse_attributes = entity_schema.all_inverse_attributes()
             
-            for inv_attr in inverse_attributes:
-                try:
-                    inverse_attr_label = inv_attr.name()
-                    
-                    if inverse_attr_label not in inv_attrs_config:
-                        continue
-                    
-                    inv_attr_uri = URIRef(inv_attrs_config[inverse_attr_label])
-                    reference_entity = inv_attr.entity_reference()
-                    
-                    # Get reference entity attributes (excluding common ones)
+            for inv_attr in entity_schema.all_inverse_attributes():
+                inverse_attr_label = inv_attr.name()
+                
+                if inverse_attr_label not in inv_attrs_config:
+                    continue
+                
+                reference_entity = inv_attr.entity_reference()
+                
+                # Get reference entity attributes (excluding common ones), once per relation type
+                reference_entity_attrs = self._reference_attrs_cache.get(reference_entity.name())
+                if reference_entity_attrs is None:
                     reference_entity_attrs = [
-                        item for item in reference_entity.all_attributes() 
-                        if item.name() not in {
-                            'GlobalId', 'OwnerHistory', 'Name', 'Description', 
-                            'RelatedObjectsType', 'ActingRole', 'ConnectionGeometry',
-                            'QuantityInProcess', 'SequenceType', 'TimeLag', 
-                            'UserDefinedSequenceType'
-                        }
+                        item for item in reference_entity.all_attributes()
+                        if item.name() not in _INVERSE_SKIP
                     ]
-                    
-                    # Skip if too many attributes (complex relationships)
-                    if len(reference_entity_attrs) > 2:
-                        continue
-                    
-                    # Determine the reference attribute
-                    inverse_of_attr = inv_attr.attribute_reference()
-                    reference_entity_attr = None
-                    
-                    if len(reference_entity_attrs) == 2:
-                        # Find the attribute that's not the inverse
-                        for ref_attr in reference_entity_attrs:
-                            if inverse_of_attr.name() != ref_attr.name():
-                                reference_entity_attr = ref_attr
-                                break
-                    elif len(reference_entity_attrs) == 1:
-                        reference_entity_attr = reference_entity_attrs[0]
-                    
-                    if not reference_entity_attr:
-                        continue
-                    
-                    # Get the relations from the entity
-                    relations = getattr(entity, inv_attr.name(), None)
-                    
-                    if relations:
-                        for relation in relations:
-                            try:
-                                content = getattr(relation, reference_entity_attr.name(), None)
-                                
-                                if content:
-                                    self._add_inverse_relation_content(instance_uri, inv_attr_uri, content)
-                            
-                            except Exception as e:
-                                logger.debug(f"Error processing relation: {e}")
-                                continue
+                    self._reference_attrs_cache[reference_entity.name()] = reference_entity_attrs
                 
-                except Exception as e:
-                    logger.debug(f"Error processing inverse attribute {inverse_attr_label}: {e}")
+                # Skip if too many attributes (complex relationships)
+                if len(reference_entity_attrs) > 2:
+                    continue
+                
+                # Determine the reference attribute
+                inverse_of_attr = inv_attr.attribute_reference()
+                reference_entity_attr = None
+                
+                if len(reference_entity_attrs) == 2:
+                    # Find the attribute that's not the inverse
+                    for ref_attr in reference_entity_attrs:
+                        if inverse_of_attr.name() != ref_attr.name():
+                            reference_entity_attr = ref_attr
+                            break
+                elif len(reference_entity_attrs) == 1:
+                    reference_entity_attr = reference_entity_attrs[0]
+                
+                if not reference_entity_attr:
                     continue
+                
+                plan.append((inverse_attr_label, inv_attrs_config[inverse_attr_label], reference_entity_attr.name()))
         
-        except Exception as e:
-            logger.debug(f"Error adding inverse attributes: {e}")
+        self._inv_attr_plan_cache[entity_type] = plan
+        return plan
     
-    def _add_inverse_relation_content(self, instance_uri: URIRef, inv_attr_uri: URIRef, content):
-        """Add inverse relation content to graph"""
+    def _add_inverse_attributes(self, entity, instance_uri: URIRef, entity_type: str, quads: List[Tuple]):
+        """Add inverse attributes based on conversion map"""
         try:
-            if isinstance(content, (tuple, list)):
-                # Handle collections
-                for item in content:
-                    if hasattr(item, 'is_a') and item.is_a() in self.conversion_map['classes']:
-                        property_item_uri, _ = self._get_instance_uri(item)
-                        self.graph.add((instance_uri, inv_attr_uri, property_item_uri))
-            else:
-                # Handle single items
-                if hasattr(content, 'is_a') and content.is_a() in self.conversion_map['classes']:
-                    property_item_uri, _ = self._get_instance_uri(content)
-                    self.graph.add((instance_uri, inv_attr_uri, property_item_uri))
+            for inverse_attr_label, inv_attr_uri, reference_attr_name in self._get_inverse_attribute_plan(entity_type):
+                # Get the relations from the entity
+                relations = getattr(entity, inverse_attr_label, None)
+                
+                if relations:
+                    for relation in relations:
+                        content = getattr(relation, reference_attr_name, None)
+                        
+                        if content:
+                            self._add_inverse_relation_content(instance_uri, inv_attr_uri, content, quads)
         
         except Exception as e:
-            logger.debug(f"Error adding inverse relation content: {e}")
+            logger.debug("Error adding inverse attributes: %s", e)
+    
+    def _add_inverse_relation_content(self, instance_uri: URIRef, inv_attr_uri: URIRef, content, quads: List[Tuple]):
+        """Add inverse relation content to graph (only mapped entities, checked up front)"""
+        if isinstance(content, (tuple, list)):
+            # Handle collections
+            for item in content:
+                if hasattr(item, 'is_a') and item.is_a() in self._class_set:
+                    property_item_uri, _ = self._get_instance_uri(item)
+                    quads.append((instance_uri, inv_attr_uri, property_item_uri, self.graph))
+        else:
+            # Handle single items
+            if hasattr(content, 'is_a') and content.is_a() in self._class_set:
+                property_item_uri, _ = self._get_instance_uri(content)
+                quads.append((instance_uri, inv_attr_uri, property_item_uri, self.graph))
 
+    def _get_spatial_relation(self, related_object) -> URIRef:
+        """Look up the BOT relation to an aggregated spatial element by entity type"""
+        entity_type = related_object.is_a()
+        relation = self._spatial_predicate.get(entity_type)
+        if relation is not None:
+            return relation
+        
+        # Subtypes (e.g. IfcBridge) resolve through their supertypes once, then hit the table directly
+        declaration = self.schema.declaration_by_name(entity_type).supertype()
+        while declaration is not None and declaration.name() not in self.SPATIAL_PREDICATES:
+            declaration = declaration.supertype()
+        
+        if declaration is not None:
+            relation = self._spatial_predicate[declaration.name()]
+        else:
+            logger.info(f"No specific spatial relation for {entity_type}, using bot:containsZone")
+            relation = self.namespaces['BOT'].containsZone
+        
+        self._spatial_predicate[entity_type] = relation
+        return relation
+    
     def _process_spatial_relationships(self):
         """Process spatial aggregation relationships"""
         try:
-            aggregations = self.ifc_file.by_type('IfcRelAggregates')
-            
-            for agg in aggregations:
-                try:
-                    relating_object = agg.RelatingObject
-                    relating_uri, _ = self._get_instance_uri(relating_object)
-                    
-                    for related_object in agg.RelatedObjects:
-                        related_uri, _ = self._get_instance_uri(related_object)
-                        
-                        # Only process spatial elements
-                        if not relating_object.is_a('IfcSpatialElement'):
-                            continue
-                        
-                        # Determine relationship type
-                        if related_object.is_a('IfcSpace'):
-                            relation = self.namespaces['BOT'].hasSpace
-                        elif related_object.is_a('IfcBuildingStorey'):
-                            relation = self.namespaces['BOT'].hasStorey
-                        elif related_object.is_a('IfcBuilding') or related_object.is_a('IfcFacility'):
-                            relation = self.namespaces['BOT'].hasBuilding
-                        else:
-                            logger.info(related_object)
-                            relation = self.namespaces['BOT'].containsZone
-                        
-                        self.graph.add((relating_uri, relation, related_uri))
+            for relating_id, related_objects in self._agg_children.items():
+                relating_object = self.ifc_file.by_id(relating_id)
                 
-                except Exception as e:
-                    logger.debug(f"Error processing aggregation: {e}")
+                # Only process spatial elements
+                if not relating_object.is_a('IfcSpatialElement'):
                     continue
+                
+                relating_uri, _ = self._get_instance_uri(relating_object)
+                
+                for related_object in related_objects:
+                    related_uri, _ = self._get_instance_uri(related_object)
+                    self._emit(relating_uri, self._get_spatial_relation(related_object), related_uri)
         
         except Exception as e:
-            logger.debug(f"Error processing spatial relationships: {e}")
+            logger.debug("Error processing spatial relationships: %s", e)
     
     def create_geometry_links(self, glb_file_path: Optional[str]):
         """Create RDF-geometry links using ontologies"""
@@ -777,63 +1193,88 @@ class CompactIFCConverter:
         logger.info("Creating geometry links in RDF...")
         
         try:
+            graph = self.graph
+            GOM, XSD_nnint = self.namespaces['GOM'], self.XSD_nnint
+            
             # Main geometry instance
-            main_geometry_uri = self.namespaces['INST'][f"geometry_{self.asset_name}"]
+            main_geometry_uri = self.INST[f"geometry_{self.asset_name}"]
             
-            self.graph.add((main_geometry_uri, self.namespaces['RDF'].type, self.namespaces['OMG'].Geometry))
-            self.graph.add((main_geometry_uri, self.namespaces['RDF'].type, self.namespaces['GOM'].MeshGeometry))
-            self.graph.add((main_geometry_uri, self.namespaces['FOG']['asGltf_v2.0-glb'], 
-                          Literal(glb_file_path, datatype=self.namespaces['XSD'].anyURI)))
+            quads = [
+                (main_geometry_uri, self.RDF_type, self.OMG_Geometry, graph),
+                (main_geometry_uri, self.RDF_type, self.GOM_MeshGeometry, graph),
+                (main_geometry_uri, self.namespaces['FOG']['asGltf_v2.0-glb'], Literal(glb_file_path, datatype=self.XSD_anyURI), graph)
+            ]
             
-            # Add metadata
-            if os.path.exists(glb_file_path):
-                file_size = os.path.getsize(glb_file_path)
-                self.graph.add((main_geometry_uri, self.namespaces['GOM'].hasFileSize, 
-                              Literal(file_size, datatype=self.namespaces['XSD'].nonNegativeInteger)))
+            # Add metadata, the size is known from writing the GLB unless an external file is linked
+            file_size = self.glb_file_size
+            if file_size is None:
+                try:
+                    file_size = os.stat(glb_file_path).st_size
+                except OSError:
+                    pass
+            if file_size is not None:
+                quads.append((main_geometry_uri, GOM.hasFileSize, Literal(file_size, datatype=XSD_nnint), graph))
             
-            total_vertices = sum(elem['vertex_count'] for elem in self.elements_data)
-            total_faces = sum(elem['face_count'] for elem in self.elements_data)
+            quads.append((main_geometry_uri, GOM.hasVertices, Literal(self._total_vertices, datatype=XSD_nnint), graph))
+            quads.append((main_geometry_uri, GOM.hasFaces, Literal(self._total_faces, datatype=XSD_nnint), graph))
             
-            self.graph.add((main_geometry_uri, self.namespaces['GOM'].hasVertices, 
-                          Literal(total_vertices, datatype=self.namespaces['XSD'].nonNegativeInteger)))
-            self.graph.add((main_geometry_uri, self.namespaces['GOM'].hasFaces, 
-                          Literal(total_faces, datatype=self.namespaces['XSD'].nonNegativeInteger)))
+            # Terms used for every element, bound once
+            RDF_type = self.RDF_type
+            OMG_Geometry = self.OMG_Geometry
+            OMG_hasGeometry = self.namespaces['OMG'].hasGeometry
+            OMG_isPartOfGeometry = self.namespaces['OMG'].isPartOfGeometry
+            GOM_MeshGeometry = self.GOM_MeshGeometry
+            GOM_hasVertices = GOM.hasVertices
+            GOM_hasFaces = GOM.hasFaces
+            INST = self.INST
             
-            # Link individual elements
-            for element_data in self.elements_data:
-                try:
-                    entity_uri = self.namespaces['INST'][element_data['global_id']]
-                    element_geometry_uri = self.namespaces['INST'][f"geometry_{element_data['global_id']}_{element_data['representation_index']}"]
-                    
-                    # Link entity to geometry
-                    self.graph.add((entity_uri, self.namespaces['OMG'].hasGeometry, element_geometry_uri))
-                    
-                    # Geometry metadata
-                    self.graph.add((element_geometry_uri, self.namespaces['RDF'].type, self.namespaces['OMG'].Geometry))
-                    self.graph.add((element_geometry_uri, self.namespaces['RDF'].type, self.namespaces['GOM'].MeshGeometry))
-                    self.graph.add((element_geometry_uri, self.namespaces['OMG'].isPartOfGeometry, main_geometry_uri))
-                    self.graph.add((element_geometry_uri, self.namespaces['GOM'].hasVertices, 
-                                  Literal(element_data['vertex_count'], datatype=self.namespaces['XSD'].nonNegativeInteger)))
-                    self.graph.add((element_geometry_uri, self.namespaces['GOM'].hasFaces, 
-                                  Literal(element_data['face_count'], datatype=self.namespaces['XSD'].nonNegativeInteger)))
+            # Vertex/face counts repeat across similar elements, share their literals
+            count_literal = lru_cache(maxsize=8192)(lambda count: Literal(count, datatype=XSD_nnint))
+            
+            # Link individual elements, elements with identical local geometry share one mesh node
+            described_meshes = set()
+            elements = zip(self.element_global_ids, self.element_geom_hashes, self.element_vertex_counts, self.element_face_counts)
+            for global_id, geom_hash, vertex_count, face_count in elements:
+                # Scoped to the asset, models sharing a base URL must not share mesh nodes
+                mesh_geometry_uri = INST[f"geometry_{self.asset_name}_{geom_hash.hex()}"]
                 
-                except Exception as e:
-                    logger.debug(f"Error linking geometry for element: {e}")
+                # Link entity to geometry
+                quads.append((INST[global_id], OMG_hasGeometry, mesh_geometry_uri, graph))
+                if geom_hash in described_meshes:
                     continue
+                described_meshes.add(geom_hash)
+                
+                # Geometry metadata, once per shared mesh
+                quads.extend((
+                    (mesh_geometry_uri, RDF_type, OMG_Geometry, graph),
+                    (mesh_geometry_uri, RDF_type, GOM_MeshGeometry, graph),
+                    (mesh_geometry_uri, OMG_isPartOfGeometry, main_geometry_uri, graph),
+                    (mesh_geometry_uri, GOM_hasVertices, count_literal(vertex_count), graph),
+                    (mesh_geometry_uri, GOM_hasFaces, count_literal(face_count), graph)
+                ))
+            
+            # One bulk insert for all geometry links
+            graph.addN(quads)
             
-            logger.info(f"Geometry links created for {len(self.elements_data)} elements")
+            logger.info(f"Geometry links created for {len(self.element_global_ids)} elements ({len(described_meshes)} meshes)")
             
         except Exception as e:
             logger.warning(f"Error creating geometry links: {e}")
     
     def save_rdf(self) -> Optional[str]:
-        """Save RDF graph"""
+        """Save RDF graph (N-Triples have already been streamed to disk and only need closing)"""
         try:
-            os.makedirs(self.rdf_output_path, exist_ok=True)
-            rdf_file_path = os.path.join(self.rdf_output_path, f"{self.asset_name}.ttl")
-            
-            self.graph.serialize(destination=rdf_file_path, format='turtle')
+            if isinstance(self.graph, StreamingNTSink):
+                self.graph.close()
+                rdf_file_path = self.graph.file_path
+            else:
+                os.makedirs(self.rdf_output_path, exist_ok=True)
+                serializer, extension = self.RDF_FORMATS[self.rdf_format]
+                rdf_file_path = os.path.join(self.rdf_output_path, f"{self.asset_name}.{extension}")
+                
+                self.graph.serialize(destination=rdf_file_path, format=serializer, encoding='utf-8')
             
+            self.rdf_file_size = os.stat(rdf_file_path).st_size
             logger.info(f"RDF saved: {rdf_file_path} ({len(self.graph)} triples)")
             return rdf_file_path
             
@@ -854,6 +1295,10 @@ class CompactIFCConverter:
                 self.conversion_results['success'] = False
                 return self.conversion_results
             
+            # Stream N-Triples to disk only once there is a model to convert
+            if isinstance(self.graph, StreamingNTSink):
+                self.graph.open()
+            
             # Cache properties
             logger.debug("Step 2: Caching properties and quantity sets")
             self._cache_properties()
@@ -891,26 +1336,26 @@ class CompactIFCConverter:
             if rdf_file_path:
                 self.conversion_results['files']['rdf'] = {
                     'path': rdf_file_path,
-                    'size': os.path.getsize(rdf_file_path),
-                    'format': 'turtle',
+                    'size': self.rdf_file_size,
+                    'format': self.rdf_format,
                     'triples': len(self.graph)
                 }
             
             if glb_file_path:
                 self.conversion_results['files']['glb'] = {
                     'path': glb_file_path,
-                    'size': os.path.getsize(glb_file_path),
+                    'size': self.glb_file_size,
                     'format': 'glb',
-                    'elements': len(self.elements_data)
+                    'elements': len(self.element_global_ids)
                 }
             
             self.conversion_results['metadata'] = {
                 'asset_name': self.asset_name,
                 'ifc_schema': str(self.ifc_file.schema),
                 'entities_processed': len(self.created_entities),
-                'geometry_elements': len(self.elements_data),
-                'total_vertices': sum(elem['vertex_count'] for elem in self.elements_data) if self.elements_data else 0,
-                'total_faces': sum(elem['face_count'] for elem in self.elements_data) if self.elements_data else 0
+                'geometry_elements': len(self.element_global_ids),
+                'total_vertices': self._total_vertices,
+                'total_faces': self._total_faces
             }
             
             logger.info(f"Conversion completed successfully for: {self.asset_name}")
@@ -921,6 +1366,11 @@ class CompactIFCConverter:
             self.conversion_results['errors'].append(error_msg)
             self.conversion_results['success'] = False
         
+        finally:
+            # No-op once save_rdf has closed the file
+            if isinstance(self.graph, StreamingNTSink):
+                self.graph.discard()
+        
         return self.conversion_results
 
 
@@ -931,7 +1381,9 @@ def convert_ifc_file(ifc_file_path: str,
                     rdf_output_path: str = "./data/rdf",
                     glb_output_path: str = "./data/glb",
                     convert_geometry: bool = True,
-                    conversion_map_path: Optional[str] = None) -> Dict[str, Any]:
+                    conversion_map_path: Optional[str] = None,
+                    compress_geometry: bool = False,
+                    rdf_format: str = 'nt') -> Dict[str, Any]:
     """
     Simple function to convert IFC file
     
@@ -943,6 +1395,8 @@ def convert_ifc_file(ifc_file_path: str,
         glb_output_path: Directory for GLB output
         convert_geometry: Whether to generate GLB file
         conversion_map_path: Path to conversion-map.json file
+        compress_geometry: Whether to Draco-compress GLB geometry (requires DracoPy)
+        rdf_format: RDF output format ('nt', 'turtle' or 'jelly')
     
     Returns:
         Dictionary with conversion results
@@ -955,7 +1409,9 @@ def convert_ifc_file(ifc_file_path: str,
         rdf_output_path=rdf_output_path,
         glb_output_path=glb_output_path,
         convert_geometry=convert_geometry,
-        conversion_map_path=conversion_map_path
+        conversion_map_path=conversion_map_path,
+        compress_geometry=compress_geometry,
+        rdf_format=rdf_format
     )
     
     return converter.convert()
@@ -977,6 +1433,10 @@ def main():
                        help='GLB output directory')
     parser.add_argument('--no-geometry', action='store_true',
                        help='Skip GLB geometry conversion')
+    parser.add_argument('--draco', action='store_true',
+                       help='Compress GLB geometry with Draco (requires DracoPy)')
+    parser.add_argument('--format', '-f', choices=list(CompactIFCConverter.RDF_FORMATS), default='nt',
+                       help='RDF output format')
     parser.add_argument('--conversion-map', '-m', 
                        help='Path to custom conversion map JSON file')
     parser.add_argument('--verbose', '-v', action='store_true',
@@ -1012,7 +1472,9 @@ def main():
             rdf_output_path=args.rdf_output,
             glb_output_path=args.glb_output,
             convert_geometry=not args.no_geometry,
-            conversion_map_path=conversion_map_path
+            conversion_map_path=conversion_map_path,
+            compress_geometry=args.draco,
+            rdf_format=args.format
         )
         
         if results['success']: